@@ -2,14 +2,34 @@
 Configuration management module for Linux-based systems.
 Handles distribution detection, path resolution, and config validation.
 """
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, fields
 from enum import Enum, auto
+from functools import lru_cache
 from pathlib import Path
+import hashlib
+import json
 import os
-import yaml
-from typing import Dict, Optional, TypedDict
-import shutil
-from pydantic import BaseModel, validator
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Set, Tuple, TypedDict
+
+# XDG base directories, resolved once per process
+_XDG_CONFIG = Path(os.environ.get('XDG_CONFIG_HOME') or os.path.expanduser('~/.config'))
+_XDG_DATA = Path(os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share'))
+
+@lru_cache(maxsize=1)
+def _yaml():
+    """Import PyYAML on first use; the JSON config cache usually avoids it"""
+    import yaml
+    try:
+        # libyaml-backed C parser/emitter, several times faster than pure Python
+        from yaml import CSafeLoader as Loader, CSafeDumper as Dumper
+    except ImportError:
+        from yaml import SafeLoader as Loader, SafeDumper as Dumper
+    return yaml, Loader, Dumper
+
+def _digest(data: bytes) -> str:
+    """Content hash used to key the parsed-config cache"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
 
 class LinuxDistribution(Enum):
     """Supported Linux distributions"""
@@ -17,6 +37,47 @@ class LinuxDistribution(Enum):
     ARCH = auto()    # Arch/BlackArch
     UNKNOWN = auto()
 
+@lru_cache(maxsize=1)
+def _detect_distribution() -> LinuxDistribution:
+    """Detect the current Linux distribution"""
+    try:
+        with open('/etc/os-release', 'r') as f:
+            os_release = f.read()
+    except OSError:
+        # Pre-systemd systems without os-release: probe the release files
+        if os.access('/etc/debian_version', os.F_OK):
+            return LinuxDistribution.DEBIAN
+        if os.access('/etc/arch-release', os.F_OK):
+            return LinuxDistribution.ARCH
+        return LinuxDistribution.UNKNOWN
+    
+    ids = set()
+    for line in os_release.splitlines():
+        key, _, value = line.partition('=')
+        if key in ('ID', 'ID_LIKE'):
+            ids.update(value.strip('"\'').split())
+    
+    if 'debian' in ids:
+        return LinuxDistribution.DEBIAN
+    if 'arch' in ids:
+        return LinuxDistribution.ARCH
+    return LinuxDistribution.UNKNOWN
+
+@lru_cache(maxsize=None)
+def _find_binaries(names: Tuple[str, ...]) -> Dict[str, Optional[str]]:
+    """Locate executables with a single pass over PATH (cached per process)"""
+    found: Dict[str, Optional[str]] = dict.fromkeys(names)
+    wanted = set(names)
+    for directory in os.environ.get('PATH', os.defpath).split(os.pathsep):
+        for name in tuple(wanted):
+            candidate = os.path.join(directory or os.curdir, name)
+            if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                found[name] = candidate
+                wanted.discard(name)
+        if not wanted:
+            break
+    return found
+
 class PathConfig(TypedDict):
     """Type definitions for path configuration"""
     hashcat: str
@@ -25,26 +86,32 @@ class PathConfig(TypedDict):
     temp: str
     potfile: str
 
-@dataclass
-class SystemPaths:
-    """System path configurations for different distributions"""
-    DEBIAN: PathConfig = {
+# System path configurations for different distributions
+_SYSTEM_PATHS: Mapping[LinuxDistribution, PathConfig] = MappingProxyType({
+    LinuxDistribution.DEBIAN: {
         'hashcat': '/usr/bin/hashcat',
         'wordlists': '/usr/share/wordlists',
         'rules': '/usr/share/hashcat/rules',
         'temp': '/tmp',
         'potfile': '~/.hashcat/hashcat.potfile'
-    }
-    
-    ARCH: PathConfig = {
+    },
+    LinuxDistribution.ARCH: {
         'hashcat': '/usr/bin/hashcat',
         'wordlists': '/usr/share/wordlists',
         'rules': '/usr/share/hashcat/rules',
         'temp': '/tmp',
         'potfile': '~/.hashcat/hashcat.potfile'
-    }
+    },
+})
+
+_REQUIRED_PATHS = frozenset({'hashcat', 'wordlists', 'rules', 'temp', 'potfile'})
+_VALID_LOG_LEVELS = frozenset({'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'})
+_VALID_THEMES = frozenset({'light', 'dark', 'system'})
+_VALID_LANGUAGES = frozenset({'en', 'es', 'fr', 'de'})
+_DATA_SUBDIRS = ('wordlists', 'rules', 'masks', 'sessions', 'logs')
 
-class ConfigModel(BaseModel):
+@dataclass
+class ConfigModel:
     """Configuration validation model"""
     paths: Dict[str, str]
     debug: bool = False
@@ -54,77 +121,88 @@ class ConfigModel(BaseModel):
     language: str = "en"
     show_notifications: bool = True
     auto_update_check: bool = True
+    version: str = "0.0.0"
     
-    @validator('paths')
-    def validate_paths(cls, v):
-        required = {'hashcat', 'wordlists', 'rules', 'temp', 'potfile'}
-        if missing := required - set(v.keys()):
+    def __post_init__(self):
+        if missing := _REQUIRED_PATHS - self.paths.keys():
             raise ValueError(f"Missing required paths: {missing}")
-        return v
-    
-    @validator('log_level')
-    def validate_log_level(cls, v):
-        valid_levels = {'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'}
-        if v.upper() not in valid_levels:
-            raise ValueError(f"Invalid log level. Must be one of {valid_levels}")
-        return v.upper()
         
-    @validator('theme')
-    def validate_theme(cls, v):
-        valid_themes = {'light', 'dark', 'system'}
-        if v.lower() not in valid_themes:
-            raise ValueError(f"Invalid theme. Must be one of {valid_themes}")
-        return v.lower()
+        self.log_level = self.log_level.upper()
+        if self.log_level not in _VALID_LOG_LEVELS:
+            raise ValueError(f"Invalid log level. Must be one of {sorted(_VALID_LOG_LEVELS)}")
         
-    @validator('language')
-    def validate_language(cls, v):
-        valid_languages = {'en', 'es', 'fr', 'de'}
-        if v.lower() not in valid_languages:
-            raise ValueError(f"Invalid language. Must be one of {valid_languages}")
-        return v.lower()
+        self.theme = self.theme.lower()
+        if self.theme not in _VALID_THEMES:
+            raise ValueError(f"Invalid theme. Must be one of {sorted(_VALID_THEMES)}")
+        
+        self.language = self.language.lower()
+        if self.language not in _VALID_LANGUAGES:
+            raise ValueError(f"Invalid language. Must be one of {sorted(_VALID_LANGUAGES)}")
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ConfigModel':
+        """Build a model from raw config data, ignoring unknown keys"""
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
 
 class Config:
     """Main configuration class"""
     def __init__(self):
-        self.distribution = self._detect_distribution()
+        self.distribution = _detect_distribution()
         self.config_dir = self._get_config_dir()
         self.config_file = self.config_dir / 'config.yml'
+        self.cache_file = self.config_dir / 'config.json.cache'
         self.data_dir = self._get_data_dir()
         self.config = self._load_config()
-        self._setup_directories()
-    
-    @staticmethod
-    def _detect_distribution() -> LinuxDistribution:
-        """Detect the current Linux distribution"""
-        if os.path.exists('/etc/debian_version'):
-            return LinuxDistribution.DEBIAN
-        elif os.path.exists('/etc/arch-release'):
-            return LinuxDistribution.ARCH
-        return LinuxDistribution.UNKNOWN
+        self._resolved_paths = self._resolve_paths()
+        # Data subdirectories are created on first use by get_data_subdir
+        self._ready_dirs: Set[str] = set()
     
     @staticmethod
     def _get_config_dir() -> Path:
         """Get the configuration directory using XDG standard"""
-        xdg_config = os.environ.get('XDG_CONFIG_HOME', os.path.expanduser('~/.config'))
-        config_dir = Path(xdg_config) / 'hashbreaker'
-        config_dir.mkdir(parents=True, exist_ok=True)
+        config_dir = _XDG_CONFIG / 'hashbreaker'
+        if not os.path.isdir(config_dir):
+            config_dir.mkdir(parents=True, exist_ok=True)
         return config_dir
     
     def _load_config(self) -> ConfigModel:
         """Load or create configuration file"""
-        if not self.config_file.exists():
+        try:
+            data_bytes = self.config_file.read_bytes()
+        except FileNotFoundError:
             return self._create_default_config()
         
-        with open(self.config_file, 'r') as f:
-            config_data = yaml.safe_load(f)
+        # Reuse the JSON sidecar while it was built from identical YAML content
+        digest = _digest(data_bytes)
+        try:
+            with open(self.cache_file, 'r') as f:
+                cached = json.load(f)
+            if cached['digest'] == digest:
+                return ConfigModel.from_dict(cached['config'])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
         
-        return ConfigModel(**config_data)
+        yaml, loader, _ = _yaml()
+        config = ConfigModel.from_dict(yaml.load(data_bytes, Loader=loader))
+        self._write_cache(config, digest)
+        return config
+    
+    def _write_cache(self, config: ConfigModel, digest: str) -> None:
+        """Atomically write the JSON sidecar cache of the parsed config"""
+        tmp_file = self.cache_file.with_suffix('.tmp')
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump({'digest': digest, 'config': asdict(config)}, f)
+            os.replace(tmp_file, self.cache_file)
+        except OSError:
+            pass
     
     def _create_default_config(self) -> ConfigModel:
         """Create default configuration based on detected distribution"""
-        paths = getattr(SystemPaths, self.distribution.name, SystemPaths.DEBIAN)
+        paths = _SYSTEM_PATHS.get(self.distribution, _SYSTEM_PATHS[LinuxDistribution.DEBIAN])
         config_data = {
-            'paths': paths,
+            'paths': dict(paths),
             'debug': False,
             'log_level': 'INFO',
             'max_processes': 4
@@ -136,70 +214,76 @@ class Config:
     
     def save_config(self, config: ConfigModel) -> None:
         """Save configuration to file"""
-        with open(self.config_file, 'w') as f:
-            yaml.safe_dump(config.dict(), f)
+        yaml, _, dumper = _yaml()
+        data_bytes = yaml.dump(asdict(config), Dumper=dumper).encode()
+        self.config_file.write_bytes(data_bytes)
+        self._write_cache(config, _digest(data_bytes))
+    
+    def _resolve_paths(self) -> Dict[str, Path]:
+        """Expand all configured paths once so lookups are plain dict reads"""
+        self._resolved_from = dict(self.config.paths)
+        return {
+            path_type: Path(os.path.expanduser(path_str))
+            for path_type, path_str in self._resolved_from.items()
+        }
+    
+    def _current_paths(self) -> Dict[str, Path]:
+        """Return the expanded paths, redoing them if self.config.paths changed"""
+        if self.config.paths != self._resolved_from:
+            self._resolved_paths = self._resolve_paths()
+        return self._resolved_paths
     
     def get_path(self, path_type: str) -> Path:
         """Resolve and return a specific path"""
-        if path_type not in self.config.paths:
-            raise KeyError(f"Unknown path type: {path_type}")
-        
-        path = Path(os.path.expanduser(self.config.paths[path_type]))
-        return path
+        try:
+            return self._current_paths()[path_type]
+        except KeyError:
+            raise KeyError(f"Unknown path type: {path_type}") from None
     
     def verify_paths(self) -> Dict[str, bool]:
         """Verify that all configured paths exist and are accessible"""
-        results = {}
-        for path_type, path_str in self.config.paths.items():
-            path = Path(os.path.expanduser(path_str))
-            results[path_type] = path.exists()
-        return results
+        exists = os.path.exists
+        return {
+            path_type: exists(path)
+            for path_type, path in self._current_paths().items()
+        }
     
     def verify_binaries(self) -> Dict[str, bool]:
         """Verify that required binaries are available"""
-        binaries = ['hashcat']
-        results = {}
-        for binary in binaries:
-            results[binary] = shutil.which(binary) is not None
-        return results
-
-        def _get_data_dir(self) -> Path:
-            """Get the data directory for storing application data"""
-            xdg_data = os.environ.get('XDG_DATA_HOME', os.path.expanduser('~/.local/share'))
-            data_dir = Path(xdg_data) / 'hashcat-gui'
+        binaries = ('hashcat',)
+        return {
+            binary: location is not None
+            for binary, location in _find_binaries(binaries).items()
+        }
+    
+    def _get_data_dir(self) -> Path:
+        """Get the data directory for storing application data"""
+        data_dir = _XDG_DATA / 'hashcat-gui'
+        if not os.path.isdir(data_dir):
             data_dir.mkdir(parents=True, exist_ok=True)
-            return data_dir
-
-        def _setup_directories(self) -> None:
-            """Setup required application directories"""
-            directories = {
-                'wordlists': self.data_dir / 'wordlists',
-                'rules': self.data_dir / 'rules',
-                'masks': self.data_dir / 'masks',
-                'sessions': self.data_dir / 'sessions',
-                'logs': self.data_dir / 'logs'
-            }
-            
-            for dir_path in directories.values():
-                dir_path.mkdir(parents=True, exist_ok=True)
-
-        def get_env_override(self, key: str) -> Optional[str]:
-            """Get environment variable override for config value"""
-            env_key = f"HASHCATGUI_{key.upper()}"
-            return os.environ.get(env_key)
-
-        def migrate_old_config(self) -> None:
-            """Migrate configuration from older versions"""
-            if not self.config_file.exists():
-                return
-                
-            with open(self.config_file, 'r') as f:
-                old_config = yaml.safe_load(f)
-                
-            version = old_config.get('version', '0.0.0')
-            if version < '0.1.0':
-                # Perform migration steps here
-                old_config['version'] = '0.1.0'
-                
-            with open(self.config_file, 'w') as f:
-                yaml.safe_dump(old_config, f)
+        return data_dir
+    
+    def get_data_subdir(self, name: str) -> Path:
+        """Return an application data subdirectory, creating it on first use"""
+        if name not in _DATA_SUBDIRS:
+            raise KeyError(f"Unknown data directory: {name}")
+        
+        path = self.data_dir / name
+        if name not in self._ready_dirs:
+            path.mkdir(exist_ok=True)
+            self._ready_dirs.add(name)
+        return path
+    
+    def get_env_override(self, key: str) -> Optional[str]:
+        """Get environment variable override for config value"""
+        env_key = f"HASHCATGUI_{key.upper()}"
+        return os.environ.get(env_key)
+    
+    def migrate_old_config(self) -> None:
+        """Migrate configuration from older versions"""
+        if self.config.version >= '0.1.0':
+            return
+        
+        # Perform migration steps here
+        self.config.version = '0.1.0'
+        self.save_config(self.config)
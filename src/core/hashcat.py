@@ -2,6 +2,7 @@
 Hashcat process management and command building module.
 Handles hashcat execution, monitoring, and result parsing.
 """
+import csv
 import os
 import subprocess
 import json
@@ -11,6 +12,11 @@ from typing import Dict, List, Optional, Union
 from dataclasses import dataclass
 from datetime import datetime
 
+# Machine-readable status: status, progress, speed, ETA, recovered, total, start time
+_STATUS_RE = re.compile(
+    r'^STATUS\t([^\t]+)\t([^\t]+)\t([^\t]+)\t([^\t]+)\t(\d+)\t(\d+)\t([\d.]+)'
+)
+
 @dataclass
 class HashcatStatus:
     """Status information for a hashcat process"""
@@ -34,6 +40,42 @@ class ExecutionError(HashcatError):
     """Process execution failed"""
     pass
 
+_PathArg = Optional[Union[str, Path]]
+
+def _build_wordlist_attack(wordlist: _PathArg, rule: _PathArg, mask: Optional[str]) -> List[str]:
+    """Arguments for attack mode 0 (wordlist)"""
+    if not wordlist:
+        raise CommandError("Wordlist required for attack mode 0")
+    args = [str(wordlist)]
+    if rule:
+        args.extend(['-r', str(rule)])
+    return args
+
+def _build_mask_attack(wordlist: _PathArg, rule: _PathArg, mask: Optional[str]) -> List[str]:
+    """Arguments for attack mode 3 (brute force)"""
+    if not mask:
+        raise CommandError("Mask required for attack mode 3")
+    return [str(mask)]
+
+def _build_hybrid_wordlist_mask(wordlist: _PathArg, rule: _PathArg, mask: Optional[str]) -> List[str]:
+    """Arguments for attack mode 6 (wordlist + mask)"""
+    if not wordlist or not mask:
+        raise CommandError("Wordlist and mask required for attack mode 6")
+    return [str(wordlist), str(mask)]
+
+def _build_hybrid_mask_wordlist(wordlist: _PathArg, rule: _PathArg, mask: Optional[str]) -> List[str]:
+    """Arguments for attack mode 7 (mask + wordlist)"""
+    if not wordlist or not mask:
+        raise CommandError("Mask and wordlist required for attack mode 7")
+    return [str(mask), str(wordlist)]
+
+_ATTACK_BUILDERS = {
+    0: _build_wordlist_attack,
+    3: _build_mask_attack,
+    6: _build_hybrid_wordlist_mask,
+    7: _build_hybrid_mask_wordlist,
+}
+
 class HashcatRunner:
     """Manages hashcat process execution and monitoring"""
     
@@ -41,15 +83,27 @@ class HashcatRunner:
         self.config = config
         self.process: Optional[subprocess.Popen] = None
         self.command: List[str] = []
+        self._stdout_tail = b''
         self._validate_hashcat_binary()
+        self._cmd_prefix = [
+            str(self.config.get_path('hashcat')),
+            '--status',
+            '--status-timer=1',
+            '--machine-readable',
+            '--quiet',
+            '--potfile-path', str(self.config.get_path('potfile')),
+        ]
     
     def _validate_hashcat_binary(self) -> None:
         """Verify hashcat binary exists and is executable"""
         hashcat_path = self.config.get_path('hashcat')
-        if not hashcat_path.exists():
+        try:
+            st = os.stat(hashcat_path)
+        except OSError:
             raise HashcatError(f"Hashcat binary not found at {hashcat_path}")
-        if not os.access(hashcat_path, os.X_OK):
+        if not st.st_mode & 0o111:
             raise HashcatError(f"Hashcat binary at {hashcat_path} is not executable")
+        self._hashcat_stat = st
     
     def build_command(self, 
                     hash_type: int,
@@ -59,29 +113,15 @@ class HashcatRunner:
                     rule: Optional[Union[str, Path]] = None,
                     mask: Optional[str] = None) -> List[str]:
         """Build hashcat command with given parameters"""
-        cmd = [
-            str(self.config.get_path('hashcat')),
-            '--status',
-            '--status-timer=1',
-            '--machine-readable',
-            '--quiet',
-            '--potfile-path', str(self.config.get_path('potfile')),
+        builder = _ATTACK_BUILDERS.get(attack_mode)
+        if builder is None:
+            raise CommandError(f"Unsupported attack mode: {attack_mode}")
+        
+        cmd = self._cmd_prefix + [
             '-m', str(hash_type),
             '-a', str(attack_mode),
             str(hash_file)
-        ]
-        
-        # Add attack-specific parameters
-        if attack_mode == 0:  # Wordlist attack
-            if not wordlist:
-                raise CommandError("Wordlist required for attack mode 0")
-            cmd.append(str(wordlist))
-            if rule:
-                cmd.extend(['-r', str(rule)])
-        elif attack_mode == 3:  # Brute force attack
-            if not mask:
-                raise CommandError("Mask required for attack mode 3")
-            cmd.append(str(mask))
+        ] + builder(wordlist, rule, mask)
         
         self.command = cmd
         return cmd
@@ -96,11 +136,14 @@ class HashcatRunner:
                 self.command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1
+                bufsize=64 * 1024
             )
         except subprocess.SubprocessError as e:
             raise ExecutionError(f"Failed to start hashcat: {e}")
+        
+        # get_status drains stdout on every poll and must never block on it
+        os.set_blocking(self.process.stdout.fileno(), False)
+        self._stdout_tail = b''
     
     def stop(self) -> None:
         """Stop hashcat process"""
@@ -127,14 +170,14 @@ class HashcatRunner:
                 time_started=datetime.now()
             )
         
-        # Read latest status from process output
+        # Drain all pending output and keep only the last complete STATUS line
+        data = self._stdout_tail + (self.process.stdout.read() or b'')
+        complete, _, self._stdout_tail = data.rpartition(b'\n')
+        _, found, status = (b'\n' + complete).rpartition(b'\nSTATUS')
         status_line = ""
-        while True:
-            line = self.process.stdout.readline()
-            if not line:
-                break
-            if line.startswith("STATUS"):
-                status_line = line
+        if found:
+            # STATUS lines are pure ASCII, so only the selected line is decoded
+            status_line = 'STATUS' + status.partition(b'\n')[0].decode('ascii', 'replace')
         
         return self._parse_status(status_line)
     
@@ -151,18 +194,22 @@ class HashcatRunner:
                 time_started=datetime.now()
             )
         
+        match = _STATUS_RE.match(status_line)
+        if not match:
+            raise HashcatError(f"Failed to parse status: {status_line!r}")
+        
+        status, progress, speed, eta, recovered, total, started = match.groups()
         try:
-            parts = status_line.split('\t')
             return HashcatStatus(
-                status=parts[1],
-                progress=float(parts[2]),
-                speed=f"{parts[3]} H/s",
-                estimated_completion=parts[4],
-                recovered_hashes=int(parts[5]),
-                total_hashes=int(parts[6]),
-                time_started=datetime.fromtimestamp(float(parts[7]))
+                status=status,
+                progress=float(progress),
+                speed=f"{speed} H/s",
+                estimated_completion=eta,
+                recovered_hashes=int(recovered),
+                total_hashes=int(total),
+                time_started=datetime.fromtimestamp(float(started))
             )
-        except (IndexError, ValueError) as e:
+        except ValueError as e:
             raise HashcatError(f"Failed to parse status: {e}")
     
     def get_results(self) -> Dict[str, str]:
@@ -171,17 +218,51 @@ class HashcatRunner:
             return {}
         
         potfile = self.config.get_path('potfile')
-        if not potfile.exists():
+        try:
+            # Potfile entries are "hash:password"; rows of any other shape are skipped
+            results = {}
+            with open(potfile, 'r', buffering=1 << 20, newline='') as f:
+                reader = csv.reader(f, delimiter=':', quoting=csv.QUOTE_NONE)
+                while True:
+                    try:
+                        row = next(reader)
+                    except StopIteration:
+                        break
+                    except csv.Error:
+                        # e.g. a $zip2$ hash over field_size_limit; the reader
+                        # drops the rest of that line and carries on
+                        continue
+                    if len(row) == 2:
+                        results[row[0]] = row[1]
+            return results
+        except FileNotFoundError:
             return {}
+    
+    def count_results(self) -> int:
+        """Count the lines in the potfile without tokenizing it.
+
+        This is a raw line count for a cheap progress figure: unlike
+        get_results it also counts malformed lines, and a hash cracked twice
+        counts twice. A last line without a trailing newline is included.
+        """
+        if not self.process:
+            return 0
         
-        results = {}
-        with open(potfile, 'r') as f:
-            for line in f:
-                try:
-                    hash_val, password = line.strip().split(':')
-                    results[hash_val] = password
-                except ValueError:
-                    continue
+        potfile = self.config.get_path('potfile')
+        try:
+            count = 0
+            last = b'\n'
+            with open(potfile, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    count += chunk.count(b'\n')
+                    last = chunk[-1:]
+            return count if last == b'\n' else count + 1
+        except FileNotFoundError:
+            return 0
         
-        return results
-
+        potfile = self.config.get_path('potfile')
+        try:
+            with open(potfile, 'rb') as f:
+                return sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1 << 20), b''))
+        except FileNotFoundError:
+            return 0
@@ -1,20 +1,32 @@
 from flask import Flask, request, jsonify, send_from_directory, Response, send_file
+import atexit
+import codecs
+import collections
+import gzip
+import os
+import pickle
+import queue
+import re
+import selectors
+import socket
 import subprocess
 from pathlib import Path
-import json
 import tempfile
 import sys
 import uuid
-import time
 import threading
 import signal
 import psutil
 import logging
-from typing import Optional, Dict, Any
+import orjson
+from typing import Optional, Dict, Any, List, Set, Tuple, Union
 from werkzeug.utils import secure_filename
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
 
 from .config import Config
 from ..utils.dialogs import FileDialog
+from ..utils.runtime import gevent_patched
 
 # Set up logging
 logging.basicConfig(
@@ -30,26 +42,74 @@ config = Config()
 
 # Global process tracking
 current_process: Optional[subprocess.Popen] = None
-
-# Load paths from config
-HASHCAT_PATH = Path(config.paths.hashcat_path)
-HASHCAT_DIR = HASHCAT_PATH.parent
-WORDLISTS_PATH = Path(config.paths.wordlists_path)
-RULES_PATH = Path(config.paths.rules_path)
-TEMP_DIR = Path(config.paths.temp_path)
-POTFILE_PATH = Path(config.paths.potfile_path)
+current_psproc: Optional[psutil.Process] = None
 
 # Default hash file name
 DEFAULT_HASH_FILE = "crackme.txt"
 
-# Initialize GUI dialog
-file_dialog = FileDialog()
+# Hashcat output lines buffered for a slow SSE client before dropping the oldest
+OUTPUT_QUEUE_SIZE = 1024
+
+# Defaults shipped with the package, which may be installed read-only
+DEFAULT_CONFIG_FILE = Path(__file__).with_name('config.json')
+# Settings edited from the web UI
+CONFIG_FILE = config.config_dir / 'settings.json'
+
+# Parsed hash_types.txt, kept in the private config dir since it is unpickled
+HASH_TYPES_CACHE = config.config_dir / 'hash_types.cache.pkl'
+
+EXAMPLE_HASHES = {
+    "0": "8743b52063cd84097a65d1633f5c74f5",
+    "100": "b89eaac7e61417341b710b727768294d0e6a277b",
+    "1000": "b4b9b02e6f09a9bd760f388b67351e2b",
+    "1800": "$6$52450745$k5ka2p8bFuSmoVT1tzOyyuaREkkKBcCNqoDKzYiJL9RaE8yMnPgh2XzzF0NDrUhgrcLwg78xs1w5pJiypEdFX/",
+    "3200": "$2a$05$LhayLxezLhK1LhWvKxCyLOj0j1u.Kj0jZ0pEmm134uzrQlFvQJLF6"
+}
+NO_EXAMPLE_HASH = "Example hash not available"
+
+# Dialogs are served by one long-lived Qt thread
+dialog_service = FileDialog()
+
+# Compact JSON body of a response, plain and gzip-compressed
+JSONPayload = Tuple[bytes, bytes]
+
+def encode_json_payload(obj: Any) -> JSONPayload:
+    """Encode a rarely-changing response body once, for every request"""
+    body = orjson.dumps(obj)
+    return body, gzip.compress(body, 6)
+
+def orjsonify(obj: Any) -> Response:
+    """jsonify replacement for hot endpoints, encoded straight to bytes"""
+    return Response(orjson.dumps(obj), mimetype='application/json')
+
+def payload_response(payload: JSONPayload) -> Response:
+    """Serve a pre-encoded JSON payload, gzipped if the client accepts it"""
+    body, compressed = payload
+    if request.accept_encodings['gzip']:
+        response = Response(compressed, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(body, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    return response
+
+EMPTY_LIST_PAYLOAD = encode_json_payload([])
 
 def load_hash_types() -> Dict[str, Any]:
     """Load hash types from hash_types.txt file"""
     hash_types = {}
     try:
-        hash_types_path = Path(config.paths.hash_types_path)
+        hash_types_path = Path(HASH_TYPES_PATH)
+        st = hash_types_path.stat()
+        cache_key = (str(hash_types_path), st.st_mtime_ns, st.st_size)
+        try:
+            with HASH_TYPES_CACHE.open('rb') as f:
+                cached_key, cached = pickle.load(f)
+            if cached_key == cache_key:
+                return cached
+        except Exception:
+            pass  # Missing, stale or unreadable cache: parse the text file
+
         with hash_types_path.open('r') as f:
             for line in f:
                 if line.strip():
@@ -57,8 +117,14 @@ def load_hash_types() -> Dict[str, Any]:
                     hash_types[mode_id] = {
                         "name": name,
                         "category": category,
-                        "example": get_example_hash(mode_id)
+                        "example": EXAMPLE_HASHES.get(mode_id, NO_EXAMPLE_HASH)
                     }
+
+        try:
+            with HASH_TYPES_CACHE.open('wb') as f:
+                pickle.dump((cache_key, hash_types), f, protocol=5)
+        except OSError as e:
+            logger.warning(f"Failed to write hash types cache {HASH_TYPES_CACHE}: {e}")
     except Exception as e:
         logger.error(f"Error loading hash types: {e}")
         # Fallback to basic hash types
@@ -69,90 +135,207 @@ def load_hash_types() -> Dict[str, Any]:
         }
     return hash_types
 
+def _load_default_config() -> Dict[str, Any]:
+    """Read the packaged defaults that saved settings are layered over"""
+    try:
+        with open(DEFAULT_CONFIG_FILE, 'rb') as f:
+            return orjson.loads(f.read())
+    except Exception as e:
+        logger.error(f"Error loading default config: {e}")
+        return {}
+
+DEFAULT_CONFIG = _load_default_config()
+
+# Merged settings, keyed by CONFIG_FILE's mtime (None while nothing is saved)
+_config_cache = {'key': None, 'value': None, 'lock': threading.Lock()}
+
+def load_config() -> Dict[str, Any]:
+    """Load configuration from config file"""
+    try:
+        try:
+            mtime = CONFIG_FILE.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        with _config_cache['lock']:
+            if _config_cache['value'] is not None and _config_cache['key'] == mtime:
+                return _config_cache['value']
+
+        value = dict(DEFAULT_CONFIG)
+        if mtime is not None:
+            with open(CONFIG_FILE, 'rb') as f:
+                value.update(orjson.loads(f.read()))
+        with _config_cache['lock']:
+            _config_cache['key'] = mtime
+            _config_cache['value'] = value
+        return value
+    except Exception as e:
+        logger.error(f"Error loading config: {e}")
+        return dict(DEFAULT_CONFIG)
+
 def save_config(config):
     """Save configuration to config file"""
     try:
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=4)
+        with _config_cache['lock']:
+            write_file_atomic(str(CONFIG_FILE), orjson.dumps(config, option=orjson.OPT_INDENT_2))
+            # Publish the saved dict so the next load skips the disk read
+            _config_cache['key'] = CONFIG_FILE.stat().st_mtime_ns
+            _config_cache['value'] = {**DEFAULT_CONFIG, **config}
         return True
     except Exception as e:
         print(f"Error saving config: {str(e)}", file=sys.stderr)
         return False
 
-# Update global variables from config
-config = load_config()
-HASHCAT_PATH = config['hashcatPath']
-HASHCAT_DIR = os.path.dirname(HASHCAT_PATH)
-WORDLISTS_PATH = config['wordlistsPath']
-RULES_PATH = config['rulesPath']
-POTFILE_PATH = config['potfilePath']
-TEMP_DIR = config['tempPath']
-
-def load_hash_types():
-    """Load hash types from hash_types.txt file"""
-    hash_types = {}
-    try:
-        with open('hash_types.txt', 'r') as f:
-            for line in f:
-                if line.strip():
-                    mode_id, name, category = line.strip().split('|')
-                    hash_types[mode_id] = {
-                        "name": name,
-                        "category": category,
-                        "example": get_example_hash(mode_id)
-                    }
-    except Exception as e:
-        print(f"Error loading hash types: {str(e)}", file=sys.stderr)
-        # Fallback to basic hash types if file can't be loaded
-        hash_types = {
-            "0": {"name": "MD5", "category": "Raw Hash", "example": "8743b52063cd84097a65d1633f5c74f5"},
-            "100": {"name": "SHA1", "category": "Raw Hash", "example": "b89eaac7e61417341b710b727768294d0e6a277b"},
-            "1000": {"name": "NTLM", "category": "Operating System", "example": "b4b9b02e6f09a9bd760f388b67351e2b"}
-        }
-    return hash_types
+# Settings every save from the web UI must provide
+SETTINGS_PATH_KEYS = (
+    'hashcatPath', 'wordlistsPath', 'rulesPath', 'hashTypesPath', 'potfilePath', 'tempPath'
+)
 
-def get_example_hash(mode_id):
-    """Return an example hash for the given mode ID"""
-    examples = {
-        "0": "8743b52063cd84097a65d1633f5c74f5",
-        "100": "b89eaac7e61417341b710b727768294d0e6a277b",
-        "1000": "b4b9b02e6f09a9bd760f388b67351e2b",
-        "1800": "$6$52450745$k5ka2p8bFuSmoVT1tzOyyuaREkkKBcCNqoDKzYiJL9RaE8yMnPgh2XzzF0NDrUhgrcLwg78xs1w5pJiypEdFX/",
-        "3200": "$2a$05$LhayLxezLhK1LhWvKxCyLOj0j1u.Kj0jZ0pEmm134uzrQlFvQJLF6"
-    }
-    return examples.get(mode_id, "Example hash not available")
+# Paths saved from the web UI take precedence over the distribution defaults
+_saved_config = load_config()
+HASHCAT_PATH = _saved_config.get('hashcatPath') or str(config.get_path('hashcat'))
+WORDLISTS_PATH = _saved_config.get('wordlistsPath') or str(config.get_path('wordlists'))
+RULES_PATH = _saved_config.get('rulesPath') or str(config.get_path('rules'))
+POTFILE_PATH = _saved_config.get('potfilePath') or str(config.get_path('potfile'))
+TEMP_DIR = _saved_config.get('tempPath') or str(config.get_path('temp'))
+HASH_TYPES_PATH = _saved_config.get('hashTypesPath') or 'hash_types.txt'
+
+def current_settings() -> Dict[str, Any]:
+    """Saved settings with the paths actually in use filled in"""
+    settings = dict(load_config())
+    settings.update({
+        'hashcatPath': HASHCAT_PATH,
+        'wordlistsPath': WORDLISTS_PATH,
+        'rulesPath': RULES_PATH,
+        'hashTypesPath': HASH_TYPES_PATH,
+        'potfilePath': POTFILE_PATH,
+        'tempPath': TEMP_DIR,
+    })
+    return settings
+
+def _refresh_derived_paths() -> None:
+    """Precompute the values run_hashcat derives from the configured paths"""
+    global HASHCAT_DIR, _WORDLISTS_RESOLVED, _RULES_RESOLVED, _DEFAULT_CMD_PREFIX
+    HASHCAT_DIR = os.path.dirname(str(HASHCAT_PATH))
+    _WORDLISTS_RESOLVED = Path(WORDLISTS_PATH).resolve()
+    _RULES_RESOLVED = Path(RULES_PATH).resolve()
+    # Index 3 is the hash type placeholder, filled per request
+    _DEFAULT_CMD_PREFIX = [
+        str(HASHCAT_PATH),
+        "-w2",
+        "-m", "",
+        "-a", "0",
+        "--status",
+        "--hwmon-disable",
+        "-O",
+    ]
+
+def _join_within(base: Path, name: str) -> Optional[str]:
+    """Join name onto a resolved base, or return None if it escapes base"""
+    path = Path(os.path.normpath(base / name))
+    return str(path) if path.is_relative_to(base) else None
+
+_refresh_derived_paths()
 
 # Load hash types on startup
 HASH_TYPES = load_hash_types()
+HASH_TYPES_PAYLOAD = encode_json_payload(HASH_TYPES)
+
+class _PotfileEventHandler(FileSystemEventHandler):
+    """Forward filesystem events for the potfile to its monitor"""
+    def __init__(self, monitor, callback):
+        self.monitor = monitor
+        self.callback = callback
+
+    def on_created(self, event):
+        self.on_modified(event)
+
+    def on_modified(self, event):
+        if event.src_path == self.monitor.potfile_path:
+            self.monitor.read_new_lines(self.callback)
 
 class PotfileMonitor:
     def __init__(self, potfile_path):
-        self.potfile_path = potfile_path
+        self.potfile_path = os.path.abspath(potfile_path)
         self.last_position = 0
         self.last_size = 0
-        self._stop = False
+        self._fh = None
+        self._tail = b''
+        self._stop = threading.Event()
+        self._read_lock = threading.Lock()
+        # inotify does not see writes made by other hosts on NFS/CIFS mounts, and
+        # watchdog's blocking inotify read would stall the gevent hub
+        self.polling = (
+            os.environ.get('HASHCATGUI_POTFILE_POLLING', '') not in ('', '0')
+            or gevent_patched()
+        )
+
+    def _close(self):
+        """Drop the open handle and any buffered partial line"""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        self._tail = b''
+
+    def read_new_lines(self, callback):
+        """Read lines appended to the potfile since the last call"""
+        try:
+            with self._read_lock:
+                try:
+                    st = os.stat(self.potfile_path)
+                except FileNotFoundError:
+                    return
+                current_size = st.st_size
+                # Truncated (clear_potfile) or replaced: start over from the top
+                if current_size < self.last_size or (
+                        self._fh is not None and os.fstat(self._fh.fileno()).st_ino != st.st_ino):
+                    self._close()
+                    self.last_position = 0
+                if current_size == self.last_size and self._fh is not None:
+                    return
+                if self._fh is None:
+                    self._fh = open(self.potfile_path, 'rb')
+                    self._fh.seek(self.last_position)
+                chunk = self._fh.read()
+                self.last_position = self._fh.tell()
+                self.last_size = current_size
+                if not chunk:
+                    return
+                # Hold back a trailing partial line until hashcat finishes it
+                *lines, self._tail = (self._tail + chunk).split(b'\n')
+                for line in lines:
+                    callback(line.decode('utf-8', errors='replace').strip())
+        except Exception as e:
+            print(f"Error monitoring potfile: {str(e)}", file=sys.stderr)
 
     def start_monitoring(self, callback):
         """Monitor the potfile for changes and call callback with new lines"""
-        while not self._stop:
-            try:
-                if os.path.exists(self.potfile_path):
-                    current_size = os.path.getsize(self.potfile_path)
-                    if current_size > self.last_size:
-                        with open(self.potfile_path, 'r') as f:
-                            f.seek(self.last_position)
-                            new_lines = f.readlines()
-                            for line in new_lines:
-                                callback(line.strip())
-                            self.last_position = f.tell()
-                        self.last_size = current_size
-            except Exception as e:
-                print(f"Error monitoring potfile: {str(e)}", file=sys.stderr)
-            time.sleep(0.1)  # Check every 100ms
+        watch_dir = os.path.dirname(self.potfile_path)
+        if self.polling or not os.path.isdir(watch_dir):
+            self._poll(callback)
+            return
+
+        observer = Observer()
+        observer.schedule(_PotfileEventHandler(self, callback), watch_dir)
+        observer.start()
+        try:
+            # Pick up anything written before the watch was in place
+            self.read_new_lines(callback)
+            self._stop.wait()
+        finally:
+            observer.stop()
+            observer.join()
+
+    def _poll(self, callback):
+        """Fallback for filesystems without reliable change notification"""
+        while not self._stop.is_set():
+            self.read_new_lines(callback)
+            self._stop.wait(0.1)  # Check every 100ms
 
     def stop(self):
         """Stop monitoring"""
-        self._stop = True
+        self._stop.set()
+        with self._read_lock:
+            self._close()
 
 @app.route('/api/paths')
 def get_paths():
@@ -164,26 +347,86 @@ def get_paths():
         'temp': TEMP_DIR
     })
 
-def get_directory_files(directory: Path) -> list[str]:
-    """Get list of files in directory"""
+# Sorted directory listings and their encoded responses, invalidated when
+# the directory mtime changes
+_dir_cache: Dict[Path, Tuple[int, List[str], JSONPayload]] = {}
+_dir_cache_lock = threading.Lock()
+
+def _scan_directory(directory: Union[str, Path]) -> Tuple[List[str], JSONPayload]:
+    """Return the sorted file names in directory and their encoded payload"""
+    # The configured paths are plain strings, as saved from the web UI
+    directory = Path(directory)
     try:
-        files = [f.name for f in directory.iterdir() if f.is_file()]
-        return sorted(files)
+        # Adding, removing or renaming an entry bumps the directory mtime
+        mtime = directory.stat().st_mtime_ns
+        with _dir_cache_lock:
+            cached_mtime, files, payload = _dir_cache.get(directory, (None, None, None))
+        if cached_mtime == mtime:
+            return files, payload
+
+        # DirEntry answers is_file() from d_type, so regular files cost no stat
+        with os.scandir(directory) as entries:
+            files = [entry.name for entry in entries if entry.is_file()]
+        files.sort()
+        payload = encode_json_payload(files)
+        with _dir_cache_lock:
+            _dir_cache[directory] = (mtime, files, payload)
+        return files, payload
     except Exception as e:
         logger.error(f"Error reading directory {directory}: {e}")
-        return []
+        return [], EMPTY_LIST_PAYLOAD
 
-def cleanup_temp_files() -> None:
-    """Clean up old temporary files"""
+def get_directory_files(directory: Path) -> list[str]:
+    """Get list of files in directory"""
+    return _scan_directory(directory)[0]
+
+# Temporary files written by this server, removed by the periodic cleanup
+_temp_files: Set[str] = set()
+_temp_files_lock = threading.Lock()
+
+def write_file_atomic(path: str, data: bytes) -> None:
+    """Write data to a sibling temp file and rename it over path"""
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(tmp_path, flags, 0o600)
     try:
-        for file_path in TEMP_DIR.glob('hashcat_*'):
-            if file_path.is_file():
-                try:
-                    file_path.unlink()
-                except Exception as e:
-                    logger.warning(f"Failed to delete temp file {file_path}: {e}")
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    except BaseException:
+        os.close(fd)
+        os.unlink(tmp_path)
+        raise
+    os.close(fd)
+    os.replace(tmp_path, path)
+
+def track_temp_file(path: str) -> None:
+    """Register a temporary file for later cleanup"""
+    with _temp_files_lock:
+        _temp_files.add(path)
+
+def remove_temp_file(path: str) -> None:
+    """Delete a temporary file and stop tracking it"""
+    with _temp_files_lock:
+        _temp_files.discard(path)
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
     except Exception as e:
-        logger.error(f"Error during temp file cleanup: {e}")
+        logger.warning(f"Failed to delete temp file {path}: {e}")
+
+def cleanup_temp_files() -> None:
+    """Delete hash files left behind by jobs whose stream never finished"""
+    with _temp_files_lock:
+        paths = list(_temp_files)
+    for path in paths:
+        remove_temp_file(path)
+
+# Files handed back by save_hashes are reused by later runs, so only the
+# per-job files created by run_hashcat are ever tracked
+atexit.register(cleanup_temp_files)
 
 @app.route('/')
 def serve_index():
@@ -191,15 +434,17 @@ def serve_index():
 
 @app.route('/api/hash_types')
 def get_hash_types():
-    return jsonify(HASH_TYPES)
+    return payload_response(HASH_TYPES_PAYLOAD)
 
 @app.route('/api/wordlists')
 def get_wordlists():
-    return jsonify(get_directory_files(WORDLISTS_PATH))
+    _, payload = _scan_directory(WORDLISTS_PATH)
+    return payload_response(payload)
 
 @app.route('/api/rules')
 def get_rules():
-    return jsonify(get_directory_files(RULES_PATH))
+    _, payload = _scan_directory(RULES_PATH)
+    return payload_response(payload)
 
 @app.route('/api/save_hashes', methods=['POST'])
 def save_hashes():
@@ -213,8 +458,7 @@ def save_hashes():
     try:
         # Create a temporary file in Windows temp directory
         temp_path = os.path.join(TEMP_DIR, DEFAULT_HASH_FILE)
-        with open(temp_path, 'w') as f:
-            f.write(hashes)
+        write_file_atomic(temp_path, hashes.encode())
         return jsonify({"file": temp_path})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -222,7 +466,7 @@ def save_hashes():
 @app.route('/api/stop_hashcat', methods=['POST'])
 def stop_hashcat():
     """Stop the currently running hashcat process"""
-    global current_process
+    global current_process, current_psproc
     try:
         if current_process:
             # Try to terminate hashcat gracefully first
@@ -232,18 +476,21 @@ def stop_hashcat():
             else:
                 current_process.terminate()
             
-            # Give it a moment to stop gracefully
-            time.sleep(1)
+            # Give it up to a second to stop gracefully
+            try:
+                current_process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                pass
             
             # If still running, force kill
-            if current_process.poll() is None:
+            parent = current_psproc
+            if current_process.poll() is None and parent is not None and parent.is_running():
                 # Kill the process and any children
-                parent = psutil.Process(current_process.pid)
-                children = parent.children(recursive=True)
-                for child in children:
+                for child in parent.children(recursive=True):
                     child.kill()
                 parent.kill()
             
+            current_psproc = None
             current_process = None
             return jsonify({"status": "success", "message": "Hashcat stopped"})
     except Exception as e:
@@ -251,30 +498,93 @@ def stop_hashcat():
     
     return jsonify({"status": "error", "message": "No running process"}), 404
 
+def _wake(sock: socket.socket) -> None:
+    """Signal the SSE generator that new output is queued"""
+    try:
+        sock.send(b'\0')
+    except (BlockingIOError, OSError):
+        pass  # A wakeup is already pending, or the stream has finished
+
+def _open_pidfd(pid: int) -> Optional[int]:
+    """Return a descriptor that becomes readable when pid exits, if supported"""
+    # os.pidfd_open needs Linux 5.3+; elsewhere exit is detected by stdout EOF
+    if not hasattr(os, 'pidfd_open'):
+        return None
+    try:
+        return os.pidfd_open(pid)
+    except OSError:
+        return None
+
+def _put_dropping_oldest(lines: queue.Queue, item: Optional[str]) -> None:
+    """Queue item without blocking, evicting the oldest entries if full"""
+    while True:
+        try:
+            lines.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                lines.get_nowait()
+            except queue.Empty:
+                pass  # The generator drained the queue in the meantime
+
+def _pump_output(stream, lines: queue.Queue, wake: socket.socket) -> None:
+    """Read a process pipe in bulk and queue its complete, decoded lines.
+
+    Each chunk is decoded and split in one pass rather than line by line.
+    When the consumer falls behind, the oldest lines are dropped so a
+    chatty process cannot grow the queue without bound. None marks EOF.
+    The pump never blocks on the queue, so it still exits after the SSE
+    client has gone away and nothing drains it.
+    """
+    # Keeps a multi-byte character split across two reads intact
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    tail = ''
+    while True:
+        chunk = stream.read(65536)
+        if not chunk:
+            break
+        *complete, tail = (tail + decoder.decode(chunk)).split('\n')
+        for line in complete:
+            _put_dropping_oldest(lines, line)
+        _wake(wake)
+
+    tail += decoder.decode(b'', final=True)
+    if tail:
+        _put_dropping_oldest(lines, tail)
+    _put_dropping_oldest(lines, None)
+    _wake(wake)
+
+# Hashcat options accepted from clients
+ALLOWED_HASHCAT_ARGS = frozenset({
+    '-m', '-a', '-w', '--status', '--hwmon-disable', '-O', '-r',
+    # Add other allowed hashcat arguments here
+})
+# Short options that take a value, which may be attached as in -w2
+_VALUED_SHORT_ARGS = frozenset({'-m', '-a', '-w', '-r'})
+_TRAVERSAL_RE = re.compile(r'\.\.|~')
+
 def validate_hashcat_args(args):
     """Validate hashcat command arguments for security"""
-    # List of allowed hashcat arguments
-    allowed_args = {
-        '-m', '-a', '-w', '--status', '--hwmon-disable', '-O', '-r',
-        # Add other allowed hashcat arguments here
-    }
-    
-    # Check each argument
-    for arg in args:
-        if arg == args[0]:  # Skip executable path
-            continue
-        if arg.startswith('-'):
-            arg_base = arg.split('=')[0] if '=' in arg else arg
-            if arg_base not in allowed_args:
-                raise ValueError(f"Invalid argument: {arg}")
-        elif '..' in arg or '~' in arg:  # Prevent directory traversal
+    # Skip the executable path, which is always the configured binary
+    for arg in args[1:]:
+        if arg.startswith('--'):
+            arg_base = arg.partition('=')[0]
+        elif arg[:2] in _VALUED_SHORT_ARGS:
+            arg_base = arg[:2]
+        elif arg.startswith('-'):
+            arg_base = arg
+        else:
+            arg_base = None
+        if arg_base is not None and arg_base not in ALLOWED_HASHCAT_ARGS:
+            raise ValueError(f"Invalid argument: {arg}")
+        if _TRAVERSAL_RE.search(arg):  # Prevent directory traversal
             raise ValueError(f"Invalid path in argument: {arg}")
     
     return True
 
 @app.route('/api/run_hashcat', methods=['POST'])
 def run_hashcat():
-    global current_process
+    global current_process, current_psproc
     
     data = request.json
     hash_type = data.get('hashType')
@@ -287,12 +597,14 @@ def run_hashcat():
     if not hash_type or not (hashes or hash_file) or not wordlist:
         return jsonify({"error": "Missing required parameters"}), 400
     
+    # Use provided hash file or create a new one
+    created_hash_file = not hash_file
     try:
-        # Use provided hash file or create a new one
-        if not hash_file:
-            hash_file = os.path.join(TEMP_DIR, DEFAULT_HASH_FILE)
-            with open(hash_file, 'w') as f:
-                f.write(hashes)
+        if created_hash_file:
+            # Unique per job so it never replaces a file from save_hashes
+            hash_file = os.path.join(TEMP_DIR, f"crackme-{uuid.uuid4().hex}.txt")
+            write_file_atomic(hash_file, hashes.encode())
+            track_temp_file(hash_file)
         
         if custom_command:
             # Split the custom command and validate
@@ -310,13 +622,13 @@ def run_hashcat():
                 if arg == "temp_hashes.txt" or arg == "crackme.txt":
                     cmd[i] = hash_file
                 elif arg.startswith("wordlists/"):
-                    wordlist_path = os.path.join(WORDLISTS_PATH, arg.replace("wordlists/", ""))
-                    if not os.path.normpath(wordlist_path).startswith(os.path.normpath(WORDLISTS_PATH)):
+                    wordlist_path = _join_within(_WORDLISTS_RESOLVED, arg.removeprefix("wordlists/"))
+                    if wordlist_path is None:
                         raise ValueError("Invalid wordlist path")
                     cmd[i] = wordlist_path
                 elif arg.startswith("rules/"):
-                    rule_path = os.path.join(RULES_PATH, arg.replace("rules/", ""))
-                    if not os.path.normpath(rule_path).startswith(os.path.normpath(RULES_PATH)):
+                    rule_path = _join_within(_RULES_RESOLVED, arg.removeprefix("rules/"))
+                    if rule_path is None:
                         raise ValueError("Invalid rule path")
                     cmd[i] = rule_path
             
@@ -324,22 +636,17 @@ def run_hashcat():
             validate_hashcat_args(cmd)
         else:
             # Default command construction
-            cmd = [
-                HASHCAT_PATH,
-                "-w2",
-                "-m", hash_type,
-                "-a", "0",
-                "--status",
-                "--hwmon-disable",
-                "-O",
-                hash_file,
-                os.path.join(WORDLISTS_PATH, wordlist)
-            ]
+            wordlist_path = _join_within(_WORDLISTS_RESOLVED, wordlist)
+            if wordlist_path is None:
+                raise ValueError("Invalid wordlist path")
+            cmd = _DEFAULT_CMD_PREFIX.copy()
+            cmd[3] = str(hash_type)
+            cmd += [hash_file, wordlist_path]
 
             # Add ruleset if specified
             if ruleset:
-                rule_path = os.path.join(RULES_PATH, ruleset)
-                if not os.path.normpath(rule_path).startswith(os.path.normpath(RULES_PATH)):
+                rule_path = _join_within(_RULES_RESOLVED, ruleset)
+                if rule_path is None:
                     raise ValueError("Invalid rule path")
                 cmd.extend(["-r", rule_path])
 
@@ -354,7 +661,7 @@ def run_hashcat():
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                universal_newlines=True,
+                bufsize=0,
                 cwd=HASHCAT_DIR,
                 creationflags=subprocess.CREATE_NEW_PROCESS_GROUP
             )
@@ -363,19 +670,29 @@ def run_hashcat():
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                universal_newlines=True,
+                bufsize=0,
                 cwd=HASHCAT_DIR,
                 preexec_fn=os.setsid
             )
 
         current_process = process
+        # Built now so stop_hashcat doesn't pay for the /proc lookups
+        current_psproc = psutil.Process(process.pid)
 
         # Set up potfile monitoring
         monitor = PotfileMonitor(POTFILE_PATH)
-        output_queue = []
+        output_queue = collections.deque()
+        stdout_lines = queue.Queue(maxsize=OUTPUT_QUEUE_SIZE)
+        stderr_chunks = []
+        # A byte on this socket wakes the generator; unlike a pipe, a socket
+        # can be passed to select() on Windows as well
+        wake_r, wake_w = socket.socketpair()
+        wake_r.setblocking(False)
+        wake_w.setblocking(False)
 
         def potfile_callback(line):
-            output_queue.append(json.dumps({"type": "cracked", "data": line}) + "\n")
+            output_queue.append(orjson.dumps({"type": "cracked", "data": line}) + b"\n")
+            _wake(wake_w)
         
         # Start monitoring in a separate thread
         monitor_thread = threading.Thread(
@@ -384,165 +701,146 @@ def run_hashcat():
         )
         monitor_thread.daemon = True
         monitor_thread.start()
+
+        stdout_pump = threading.Thread(
+            target=_pump_output,
+            args=(process.stdout, stdout_lines, wake_w),
+            daemon=True
+        )
+        stdout_pump.start()
+        stderr_reader = threading.Thread(
+            target=lambda: stderr_chunks.append(process.stderr.read()),
+            daemon=True
+        )
+        stderr_reader.start()
         
         def generate():
+            pidfd = _open_pidfd(process.pid)
             try:
-                while True:
-                    # Check for any cracked hashes first
-                    while output_queue:
-                        yield output_queue.pop(0)
-
-                    # Then check hashcat output
-                    output = process.stdout.readline()
-                    if output == '' and process.poll() is not None:
-                        break
-                    if output:
-                        yield json.dumps({"type": "output", "data": output.strip()}) + "\n"
-                
-                stderr_output = process.stderr.read()
+                with selectors.DefaultSelector() as sel:
+                    sel.register(wake_r, selectors.EVENT_READ)
+                    if pidfd is not None:
+                        sel.register(pidfd, selectors.EVENT_READ)
+                    stdout_open, exited = True, False
+                    while stdout_open and not exited:
+                        for key, _ in sel.select():
+                            if key.fd == pidfd:
+                                # Hashcat has exited; a child it left behind may
+                                # still hold stdout open, so don't wait for EOF
+                                sel.unregister(pidfd)
+                                stdout_pump.join(timeout=1)
+                                exited = True
+                        try:
+                            wake_r.recv(4096)
+                        except BlockingIOError:
+                            pass
+
+                        while output_queue:
+                            yield output_queue.popleft()
+
+                        while True:
+                            try:
+                                line = stdout_lines.get_nowait()
+                            except queue.Empty:
+                                break
+                            if line is None:
+                                stdout_open = False
+                                break
+                            output = line.strip()
+                            if output:
+                                yield orjson.dumps({"type": "output", "data": output}) + b"\n"
+
+                stderr_reader.join(timeout=1 if exited else None)
+                stderr_output = b''.join(stderr_chunks).decode(errors='replace').strip()
                 if stderr_output:
-                    yield json.dumps({"type": "error", "data": stderr_output.strip()}) + "\n"
+                    yield orjson.dumps({"type": "error", "data": stderr_output}) + b"\n"
                 
-                rc = process.poll()
+                rc = process.wait()
+                while output_queue:
+                    yield output_queue.popleft()
                 if rc != 0:
-                    yield json.dumps({"type": "error", "data": f"Process exited with code {rc}"}) + "\n"
+                    yield orjson.dumps({"type": "error", "data": f"Process exited with code {rc}"}) + b"\n"
             finally:
                 monitor.stop()
                 monitor_thread.join(timeout=1)
+                wake_r.close()
+                wake_w.close()
+                if pidfd is not None:
+                    os.close(pidfd)
+                if created_hash_file:
+                    remove_temp_file(hash_file)
         
         return Response(generate(), mimetype='text/plain')
     
     except Exception as e:
         print(f"Error executing hashcat: {str(e)}", file=sys.stderr)
+        # No stream will run to delete the job's own hash file
+        if created_hash_file and hash_file:
+            remove_temp_file(hash_file)
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/get_config')
 def get_config():
     """Return current configuration"""
-    return jsonify(load_config())
+    return orjsonify(current_settings())
 
 @app.route('/api/save_config', methods=['POST'])
 def save_configuration():
     """Save new configuration"""
     try:
-        config = request.json
-        if save_config(config):
+        new_config = request.json
+        if not isinstance(new_config, dict):
+            return jsonify({"success": False, "error": "Invalid configuration"})
+        # Check everything before writing the file or touching any global
+        missing = [key for key in SETTINGS_PATH_KEYS
+                   if not isinstance(new_config.get(key), str) or not new_config[key]]
+        if missing:
+            return jsonify({"success": False, "error": f"Missing configuration values: {', '.join(missing)}"})
+
+        if save_config(new_config):
             # Update global variables
-            global HASHCAT_PATH, HASHCAT_DIR, WORDLISTS_PATH, RULES_PATH, POTFILE_PATH, TEMP_DIR
-            HASHCAT_PATH = config['hashcatPath']
-            HASHCAT_DIR = os.path.dirname(HASHCAT_PATH)
-            WORDLISTS_PATH = config['wordlistsPath']
-            RULES_PATH = config['rulesPath']
-            POTFILE_PATH = config['potfilePath']
-            TEMP_DIR = config['tempPath']
+            global HASHCAT_PATH, WORDLISTS_PATH, RULES_PATH, POTFILE_PATH, TEMP_DIR
+            global HASH_TYPES_PATH, HASH_TYPES, HASH_TYPES_PAYLOAD
+            HASHCAT_PATH = new_config['hashcatPath']
+            WORDLISTS_PATH = new_config['wordlistsPath']
+            RULES_PATH = new_config['rulesPath']
+            POTFILE_PATH = new_config['potfilePath']
+            TEMP_DIR = new_config['tempPath']
+            _refresh_derived_paths()
+            if new_config['hashTypesPath'] != HASH_TYPES_PATH:
+                HASH_TYPES_PATH = new_config['hashTypesPath']
+                HASH_TYPES = load_hash_types()
+                HASH_TYPES_PAYLOAD = encode_json_payload(HASH_TYPES)
             return jsonify({"success": True})
         else:
             return jsonify({"success": False, "error": "Failed to save configuration"})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})
 
-def create_file_dialog(title, filetypes=None, initialdir=None):
-    """Create a file dialog with proper thread handling"""
-    try:
-        root = get_tk_root()
-        if not root:
-            raise Exception("Could not create Tkinter window")
-
-        if initialdir is None:
-            initialdir = os.path.expanduser('~')
-
-        # Use a queue to get the result from the main thread
-        result_queue = queue.Queue()
-        
-        def show_dialog():
-            try:
-                path = filedialog.askopenfilename(
-                    parent=root,
-                    title=title,
-                    filetypes=filetypes if filetypes else [('All files', '*.*')],
-                    initialdir=initialdir
-                )
-                result_queue.put(path)
-            except Exception as e:
-                result_queue.put(None)
-                print(f"Error in file dialog: {str(e)}", file=sys.stderr)
-
-        root.after(0, show_dialog)
-        file_path = result_queue.get(timeout=300)  # 5 minute timeout
-        
-        if file_path:
-            return os.path.normpath(file_path)
-        return None
-    except Exception as e:
-        print(f"Error in file dialog: {str(e)}", file=sys.stderr)
-        raise
-
-def create_directory_dialog(title, initialdir=None):
-    """Create a directory dialog with proper thread handling"""
-    try:
-        root = get_tk_root()
-        if not root:
-            raise Exception("Could not create Tkinter window")
-
-        if initialdir is None:
-            initialdir = os.path.expanduser('~')
-
-        # Use a queue to get the result from the main thread
-        result_queue = queue.Queue()
-        
-        def show_dialog():
-            try:
-                path = filedialog.askdirectory(
-                    parent=root,
-                    title=title,
-                    initialdir=initialdir
-                )
-                result_queue.put(path)
-            except Exception as e:
-                result_queue.put(None)
-                print(f"Error in directory dialog: {str(e)}", file=sys.stderr)
-
-        root.after(0, show_dialog)
-        dir_path = result_queue.get(timeout=300)  # 5 minute timeout
-        
-        if dir_path:
-            return os.path.normpath(dir_path)
-        return None
-    except Exception as e:
-        print(f"Error in directory dialog: {str(e)}", file=sys.stderr)
-        raise
-
 @app.route('/api/file_dialog', methods=['POST'])
 def file_dialog():
     try:
         data = request.get_json()
         file_type = data.get('type', '')
-        input_id = data.get('inputId', '')
 
         # Set up file type filters
         if file_type == 'exe':
-            filetypes = [('Executable files', '*.exe')]
+            name_filter = 'Executable files (*.exe)'
         elif file_type == 'txt':
-            filetypes = [('Text files', '*.txt')]
+            name_filter = 'Text files (*.txt)'
         elif file_type == 'potfile':
-            filetypes = [('Potfiles', '*.potfile'), ('All files', '*.*')]
+            name_filter = 'Potfiles (*.potfile);;All files (*)'
         else:
-            filetypes = [('All files', '*.*')]
+            name_filter = 'All files (*)'
 
-        # Open the file dialog
-        root = tk.Tk()
-        root.withdraw()  # Hide the main window
-        root.attributes('-topmost', True)  # Bring dialog to front
-        
-        file_path = filedialog.askopenfilename(
-            title=f'Select {file_type.upper()} file',
-            filetypes=filetypes
+        file_path = dialog_service.open_file(
+            f'Select {file_type.upper()} file',
+            os.path.expanduser('~'),
+            name_filter
         )
-        
-        root.destroy()
 
         if file_path:
-            return jsonify({'path': file_path})
+            return jsonify({'path': str(file_path)})
         return jsonify({'error': 'No file selected'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -550,22 +848,13 @@ def file_dialog():
 @app.route('/api/directory_dialog', methods=['POST'])
 def directory_dialog():
     try:
-        data = request.get_json()
-        input_id = data.get('inputId', '')
-
-        # Open the directory dialog
-        root = tk.Tk()
-        root.withdraw()  # Hide the main window
-        root.attributes('-topmost', True)  # Bring dialog to front
-        
-        dir_path = filedialog.askdirectory(
-            title='Select Directory'
+        dir_path = dialog_service.select_directory(
+            'Select Directory',
+            os.path.expanduser('~')
         )
-        
-        root.destroy()
 
         if dir_path:
-            return jsonify({'path': dir_path})
+            return jsonify({'path': str(dir_path)})
         return jsonify({'error': 'No directory selected'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -595,11 +884,6 @@ def serve_png(filename):
 def serve_css():
     return send_file('styles.css', mimetype='text/css')
 
-@app.teardown_request
-def cleanup_request(exception=None):
-    """Clean up temporary files after the request is done"""
-    cleanup_temp_files()
-
 if __name__ == '__main__':
     print(f"Starting server with following paths:")
     print(f"Hashcat: {HASHCAT_PATH}")
@@ -608,8 +892,6 @@ if __name__ == '__main__':
     print(f"Temp Directory: {TEMP_DIR}")
     print(f"Default Hash File: {os.path.join(TEMP_DIR, DEFAULT_HASH_FILE)}")
     
-    # Initial cleanup of temp files
-    cleanup_temp_files()
-    
-    # Run Flask with debug mode (Tkinter is now handled in a separate thread)
-    app.run(host='0.0.0.0', port=5000, debug=True) 
\ No newline at end of file
+    # Flask's development server handles one request at a time; deploy with
+    # gunicorn and gevent workers instead (see wsgi.py)
+    app.run(host='0.0.0.0', port=5000, debug=os.environ.get('FLASK_DEV') == '1') 
\ No newline at end of file
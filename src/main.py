@@ -6,6 +6,7 @@ Handles web server setup and WebSocket integration.
 from flask import Flask, render_template, jsonify, request
 from flask_socketio import SocketIO, emit
 import os
+from concurrent.futures import ThreadPoolExecutor
 from core.config import Config
 from core.hashcat import HashcatRunner
 
@@ -16,6 +17,63 @@ socketio = SocketIO(app)
 config = Config()
 hashcat = HashcatRunner(config)
 
+# Threads used to walk top-level wordlist subdirectories concurrently
+WALK_WORKERS = 8
+
+# Wordlist names per root, reused while no directory mtime in the tree changes
+_wordlist_cache = {}
+
+def _iter_files(root):
+    """Walk root iteratively, returning file names and each directory's mtime"""
+    names = []
+    dir_mtimes = {}
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            dir_mtimes[directory] = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # Don't descend through directory symlinks, which can loop
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        names.append(entry.name)
+        except OSError:
+            continue
+    return names, dir_mtimes
+
+def _scan_wordlists(root):
+    """List every file under root, scanning subdirectories in parallel"""
+    names = []
+    dir_mtimes = {root: os.stat(root).st_mtime_ns}
+    subdirs = []
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.is_file():
+                names.append(entry.name)
+
+    if len(subdirs) > 1:
+        with ThreadPoolExecutor(max_workers=min(WALK_WORKERS, len(subdirs))) as pool:
+            # map() yields in submission order, so the listing order is stable
+            results = list(pool.map(_iter_files, subdirs))
+    else:
+        results = [_iter_files(subdir) for subdir in subdirs]
+
+    for sub_names, sub_mtimes in results:
+        names.extend(sub_names)
+        dir_mtimes.update(sub_mtimes)
+    return names, dir_mtimes
+
+def _tree_unchanged(dir_mtimes):
+    """Check that no directory in a previous scan has been modified"""
+    try:
+        return all(os.stat(d).st_mtime_ns == mtime for d, mtime in dir_mtimes.items())
+    except OSError:
+        return False
+
 @app.route('/')
 def index():
     """Render the main application page"""
@@ -27,7 +85,13 @@ def get_wordlists():
     wordlists_path = config.get_path('wordlists')
     wordlists = []
     if wordlists_path.exists():
-        wordlists = [f.name for f in wordlists_path.glob('**/*') if f.is_file()]
+        root = str(wordlists_path)
+        cached = _wordlist_cache.get(root)
+        if cached and _tree_unchanged(cached[1]):
+            wordlists = cached[0]
+        else:
+            wordlists, dir_mtimes = _scan_wordlists(root)
+            _wordlist_cache[root] = (wordlists, dir_mtimes)
     return jsonify(wordlists)
 
 @app.route('/api/rules')
@@ -78,5 +142,5 @@ def run_server(debug=False, host='127.0.0.1', port=5000):
     socketio.run(app, host=host, port=port, debug=debug)
 
 if __name__ == '__main__':
-    run_server(debug=True)
+    run_server(debug=os.environ.get('FLASK_DEV') == '1')
 
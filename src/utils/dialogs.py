@@ -4,14 +4,19 @@ This module provides a clean interface for showing file and directory selection
 dialogs using PyQt5. It handles the Qt application lifecycle and provides both
 synchronous and asynchronous dialog options.
 """
-from typing import List, Optional, Union
+from typing import Any, Callable, List, Optional, Union
 from pathlib import Path
+import os
+import queue
 import sys
+import threading
 from functools import wraps
 
 from PyQt5.QtWidgets import QApplication, QFileDialog
 from PyQt5.QtCore import Qt
 
+from .runtime import gevent_patched
+
 class DialogError(Exception):
     """Base exception class for dialog-related errors."""
     pass
@@ -114,6 +119,147 @@ def get_directory(
     except Exception as e:
         raise DialogError(f"Error showing directory selection dialog: {e}")
 
+def _display_available() -> bool:
+    """Check for a display before creating a QApplication.
+
+    Qt aborts the whole process, rather than raising, when it cannot load a
+    platform plugin, so a headless server has to be caught up front.
+    """
+    if sys.platform in ('win32', 'darwin') or os.environ.get('QT_QPA_PLATFORM'):
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+_qapp: Optional[QApplication] = None
+
+def _create_qapp() -> None:
+    """Create the QApplication on the calling thread, which then owns it."""
+    global _qapp
+    # Kept in a global so the application is not collected
+    _qapp = QApplication.instance() or QApplication(sys.argv)
+
+class FileDialog:
+    """Dialog service backed by one long-lived Qt thread.
+
+    Spinning up a GUI toolkit per request is expensive, so a single
+    QApplication is created in a daemon thread on the first dialog request.
+    Callers from any thread hand requests to it through a queue and block
+    until the user closes the dialog.
+    """
+
+    def __init__(self, timeout: float = 300):
+        """Set up the service; the Qt thread starts on first use.
+
+        Args:
+            timeout: Seconds to wait for the user before giving up
+        """
+        self.timeout = timeout
+        self._requests: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        # Under gevent, a one-thread native pool stands in for the Qt thread
+        self._pool = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        """Start the Qt thread if it is not running yet.
+
+        Raises:
+            DialogError: If no display is available or Qt fails to start
+        """
+        with self._start_lock:
+            if self._thread is not None or self._pool is not None:
+                return
+            if not _display_available():
+                raise DialogError("No display available for file dialogs")
+
+            if gevent_patched():
+                # Patched threads are greenlets, and a modal dialog would block
+                # the hub; gevent's pool runs on a real OS thread instead
+                from gevent.threadpool import ThreadPool
+                pool = ThreadPool(1)
+                try:
+                    pool.apply(_create_qapp)
+                except Exception as e:
+                    pool.kill()
+                    raise DialogError(f"Error starting Qt: {e}")
+                self._pool = pool
+                return
+
+            ready: queue.Queue = queue.Queue(maxsize=1)
+            thread = threading.Thread(
+                target=self._dialog_loop, args=(ready,), name="qt-dialogs", daemon=True
+            )
+            thread.start()
+            error = ready.get()
+            if error is not None:
+                raise DialogError(f"Error starting Qt: {error}")
+            self._thread = thread
+
+    def _dialog_loop(self, ready: queue.Queue) -> None:
+        """Own the QApplication and run queued dialogs one at a time."""
+        try:
+            _create_qapp()
+        except Exception as e:
+            ready.put(e)
+            return
+        ready.put(None)
+
+        while True:
+            func, args, result = self._requests.get()
+            try:
+                result.put((True, func(*args)))
+            except Exception as e:
+                result.put((False, e))
+
+    def _call(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a dialog function on the Qt thread and wait for its result."""
+        self._ensure_started()
+        if self._pool is not None:
+            from gevent import Timeout
+            try:
+                return self._pool.spawn(func, *args).get(timeout=self.timeout)
+            except Timeout:
+                raise DialogError("Timed out waiting for dialog selection")
+        result: queue.Queue = queue.Queue(maxsize=1)
+        self._requests.put((func, args, result))
+        try:
+            ok, value = result.get(timeout=self.timeout)
+        except queue.Empty:
+            raise DialogError("Timed out waiting for dialog selection")
+        if not ok:
+            raise value
+        return value
+
+    def open_file(
+        self,
+        caption: str = "Open File",
+        directory: Union[str, Path] = ".",
+        filter: str = "All Files (*.*)"
+    ) -> Optional[Path]:
+        """Show a file open dialog on the Qt thread.
+
+        Returns:
+            Path object for selected file or None if cancelled
+
+        Raises:
+            DialogError: If the dialog fails or times out
+        """
+        return self._call(get_open_file, caption, directory, filter)
+
+    def select_directory(
+        self,
+        caption: str = "Select Directory",
+        directory: Union[str, Path] = "."
+    ) -> Optional[Path]:
+        """Show a directory selection dialog on the Qt thread.
+
+        Returns:
+            Path object for selected directory or None if cancelled
+
+        Raises:
+            DialogError: If the dialog fails or times out
+        """
+        return self._call(get_directory, caption, directory)
+
 async def async_get_open_file(*args, **kwargs) -> Union[Optional[Path], List[Path]]:
     """Async version of get_open_file."""
     return get_open_file(*args, **kwargs)
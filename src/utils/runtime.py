@@ -0,0 +1,15 @@
+"""Helpers for adapting to how the server process is being run."""
+import sys
+
+
+def gevent_patched() -> bool:
+    """Return True if gevent has replaced threads with greenlets.
+
+    wsgi.py monkey-patches the standard library for gunicorn's gevent
+    worker. Anything that blocks inside C code there (inotify reads, Qt's
+    modal event loop) stalls every request, so it must run elsewhere.
+    """
+    if 'gevent' not in sys.modules:
+        return False
+    from gevent import monkey
+    return monkey.is_module_patched('threading')
@@ -0,0 +1,14 @@
+"""Shared test setup."""
+import os
+import shutil
+import tempfile
+
+# src.core.config resolves the XDG base directories at import time, so they
+# must point somewhere disposable before any test imports the server
+_XDG_ROOT = tempfile.mkdtemp(prefix="hashcat-gui-tests-")
+os.environ["XDG_CONFIG_HOME"] = os.path.join(_XDG_ROOT, "config")
+os.environ["XDG_DATA_HOME"] = os.path.join(_XDG_ROOT, "data")
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_XDG_ROOT, ignore_errors=True)
@@ -0,0 +1,100 @@
+"""Tests for the directory listing endpoints in src.core.server."""
+import gzip
+import json
+
+import pytest
+
+from src.core import server
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Test client with wordlist and rule directories configured as strings."""
+    wordlists = tmp_path / "wordlists"
+    rules = tmp_path / "rules"
+    wordlists.mkdir()
+    rules.mkdir()
+    (wordlists / "rockyou.txt").write_text("password\n")
+    (wordlists / "common.txt").write_text("123456\n")
+    (wordlists / "nested").mkdir()
+    (rules / "best64.rule").write_text(":\n")
+
+    # save_configuration stores the paths exactly as the UI sends them
+    monkeypatch.setattr(server, "WORDLISTS_PATH", str(wordlists))
+    monkeypatch.setattr(server, "RULES_PATH", str(rules))
+    monkeypatch.setattr(server, "_WORDLISTS_RESOLVED", wordlists.resolve())
+    monkeypatch.setattr(server, "_RULES_RESOLVED", rules.resolve())
+    return server.app.test_client()
+
+
+def test_wordlists_lists_files(client):
+    response = client.get("/api/wordlists")
+    assert response.status_code == 200
+    assert response.get_json() == ["common.txt", "rockyou.txt"]
+
+
+def test_rules_lists_files(client):
+    response = client.get("/api/rules")
+    assert response.status_code == 200
+    assert response.get_json() == ["best64.rule"]
+
+
+def test_wordlists_gzip(client):
+    response = client.get("/api/wordlists", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(response.data)) == ["common.txt", "rockyou.txt"]
+
+
+@pytest.mark.parametrize("arg", ["-w2", "-m", "1000", "--status", "-r", "best64.rule"])
+def test_validate_hashcat_args_accepts(arg):
+    assert server.validate_hashcat_args(["hashcat", arg])
+
+
+@pytest.mark.parametrize("arg", ["-Oa", "--outfile", "--outfile=out.txt", "-r../x", "~/x"])
+def test_validate_hashcat_args_rejects(arg):
+    with pytest.raises(ValueError):
+        server.validate_hashcat_args(["hashcat", arg])
+
+
+@pytest.fixture
+def wordlists_root(tmp_path):
+    root = tmp_path / "wordlists"
+    root.mkdir()
+    return root.resolve()
+
+
+@pytest.mark.parametrize("name", ["../../etc/passwd", "/etc/passwd", "../wordlists_evil/list.txt"])
+def test_join_within_rejects_escapes(wordlists_root, name):
+    (wordlists_root.parent / "wordlists_evil").mkdir()
+    assert server._join_within(wordlists_root, name) is None
+
+
+def test_join_within_accepts_symlink_inside_root(wordlists_root, tmp_path):
+    target = tmp_path / "elsewhere.txt"
+    target.write_text("password\n")
+    (wordlists_root / "linked.txt").symlink_to(target)
+    assert server._join_within(wordlists_root, "linked.txt") == str(wordlists_root / "linked.txt")
+
+
+def test_run_hashcat_rejects_wordlist_traversal(client):
+    response = client.post("/api/run_hashcat", json={
+        "hashType": "0",
+        "hashFile": "crackme.txt",
+        "wordlist": "rockyou.txt",
+        "customCommand": "hashcat.exe -m 0 crackme.txt wordlists/../../etc/passwd",
+    })
+    assert response.status_code == 500
+    assert response.get_json() == {"error": "Invalid wordlist path"}
+
+
+def test_run_hashcat_removes_its_hash_file_on_error(client, monkeypatch, tmp_path):
+    temp_dir = tmp_path / "temp"
+    temp_dir.mkdir()
+    monkeypatch.setattr(server, "TEMP_DIR", str(temp_dir))
+    response = client.post("/api/run_hashcat", json={
+        "hashType": "0",
+        "hashes": "8743b52063cd84097a65d1633f5c74f5",
+        "wordlist": "../outside.txt",
+    })
+    assert response.get_json() == {"error": "Invalid wordlist path"}
+    assert list(temp_dir.iterdir()) == []
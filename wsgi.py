@@ -0,0 +1,17 @@
+"""
+WSGI entry point for running HashCat-GUI under gunicorn with gevent workers.
+
+    gunicorn -k gevent -w 1 -b 127.0.0.1:5000 wsgi:app
+
+A single worker is intentional: the running hashcat process is tracked in
+module state, so /api/stop_hashcat must reach the worker that started it.
+gevent gives that worker one greenlet per request, so SSE streams from
+/api/run_hashcat do not hold up the other endpoints while they wait on
+hashcat. Code that blocks in C still stalls the whole worker; see the
+README for what the server changes when it detects gevent.
+"""
+# Patch before anything imports socket, subprocess, threading or time
+from gevent import monkey
+monkey.patch_all()
+
+from src.core.server import app  # noqa: E402